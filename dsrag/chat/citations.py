@@ -86,7 +86,6 @@ def convert_elements_to_page_content(elements: list[dict], kb_id: str, doc_id: s
             pages[page_num] = []
         pages[page_num].append(element["content"])
 
-    # Save each page's content
-    for page_num, contents in pages.items():
-        page_content = "\n".join(contents)
-        file_system.save_page_content(kb_id, doc_id, page_num, page_content)
\ No newline at end of file
+    # Save all of the pages' content in one batch
+    page_contents = {page_num: "\n".join(contents) for page_num, contents in pages.items()}
+    file_system.save_page_contents_bulk(kb_id, doc_id, page_contents)
\ No newline at end of file
@@ -1,11 +1,355 @@
 import os
-from ..utils.imports import boto3
+import re
+import sys
+import functools
+import importlib.util
+from ..utils.imports import boto3, botocore, liburing, aiobotocore, msgpack
+from .page_store import LocalPageStore
 import io
 import json
+import math
+import logging
+import asyncio
+import shutil
+import threading
+import concurrent.futures
+import operator
+from collections import OrderedDict
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the (slower) standard library json module
+    orjson = None
+
+logger = logging.getLogger("dsrag.dsparse.file_system")
+
+# Maximum number of concurrent S3 requests issued when fetching many objects at once
+S3_MAX_WORKERS = 32
+# delete_objects accepts at most 1000 keys per request; this many requests are issued concurrently
+S3_DELETE_BATCH_SIZE = 1000
+S3_DELETE_MAX_WORKERS = 8
+# Number of images encoded concurrently by save_images_bulk (PIL releases the GIL while encoding)
+IMAGE_ENCODE_MAX_WORKERS = min(8, os.cpu_count() or 1)
+# Written to S3 once a document's page images have been saved, so they can be found without listing the prefix
+PAGE_IMAGE_MANIFEST_NAME = "manifest.json"
+# Maximum number of parsed load_data results (e.g. elements.json) kept in memory per file system, when caching is enabled
+DATA_CACHE_SIZE = 32
+
+# orjson only handles integers in this range; it reads wider integers as floats with at least this magnitude
+_ORJSON_INT_MIN = -2**63
+_ORJSON_INT_MAX = 2**64 - 1
+_ORJSON_FLOAT_LIMIT = float(2**63)
+
+# Matches page image names such as "page_12.jpg" (or S3 keys ending in one), capturing the page number and extension
+_PAGE_IMAGE_RE = re.compile(r'(?:^|/)page_(\d+)\.(jpg|jpeg|png)$')
+# Matches the page number at the end of a file name such as "page_12.jpg"
+_PAGE_NUMBER_RE = re.compile(r'_(\d+)\.[A-Za-z]+$')
+# Page image extensions in order of preference, for backward compatibility with older documents
+_PAGE_IMAGE_EXTENSIONS = ('jpg', 'jpeg', 'png')
+# Image file suffixes, as a tuple so they can be checked with a single str.endswith call
+_IMG_EXTS = ('.jpg', '.jpeg', '.png')
+
+
+def _map_page_images(names: List[str]) -> dict[int, str]:
+    """
+    Map each page number to its image name, keeping the preferred extension when a page exists in several formats
+    """
+    page_images = {}
+    page_ranks = {}
+    for name in names:
+        match = _PAGE_IMAGE_RE.search(name)
+        if match is None:
+            continue
+        page_number = int(match.group(1))
+        rank = _PAGE_IMAGE_EXTENSIONS.index(match.group(2))
+        if page_number not in page_ranks or rank < page_ranks[page_number]:
+            page_images[page_number] = name
+            page_ranks[page_number] = rank
+    return page_images
+
+
+def _sort_by_page_number(file_paths: List[str]) -> List[str]:
+    """
+    Sort file paths by the page number at the end of their names. Paths without a page number are placed last.
+    """
+    # Parse each page number once up front rather than re-splitting the path inside the sort
+    pairs = []
+    for file_path in file_paths:
+        match = _PAGE_NUMBER_RE.search(file_path)
+        pairs.append((int(match.group(1)) if match else float('inf'), file_path))
+    pairs.sort(key=operator.itemgetter(0))
+    return [file_path for _, file_path in pairs]
+
+
+def _round_trips_through_orjson(data) -> bool:
+    """
+    Whether data only contains values that orjson writes and reads the same way the json module does. orjson writes
+    NaN and infinity as null, rejects integers wider than 64 bits, and reads such integers back as floats, so a float
+    that large is treated as possibly having been one.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            continue
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, float):
+            if not math.isfinite(value) or abs(value) >= _ORJSON_FLOAT_LIMIT:
+                return False
+        elif isinstance(value, int):
+            if not _ORJSON_INT_MIN <= value <= _ORJSON_INT_MAX:
+                return False
+    return True
+
+
+def _dumps_json(data, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON, using orjson when it's installed and the data would be read back unchanged
+    """
+    if orjson is not None and _round_trips_through_orjson(data):
+        # Non-string keys are converted to strings, as the json module does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            # orjson rejects some other data the json module accepts
+            pass
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+# Formats page content can be saved in (also the file extensions). Page content is saved in the format the file system
+# was configured with. JSON file systems only load JSON pages; MessagePack file systems also load JSON pages, so that
+# documents saved before switching to MessagePack can still be loaded
+PAGE_CONTENT_FORMATS = ("json", "msgpack")
+_PAGE_CONTENT_TYPES = {"msgpack": "application/x-msgpack", "json": "application/json"}
+
+
+def _check_page_content_format(page_content_format: str) -> str:
+    if page_content_format not in PAGE_CONTENT_FORMATS:
+        raise ValueError(f"page_content_format must be one of {PAGE_CONTENT_FORMATS}, got {page_content_format!r}")
+    return page_content_format
+
+
+def _page_content_extensions(page_content_format: str) -> List[str]:
+    """
+    The formats to try when loading a page's text content, starting with the one pages are saved in. Only MessagePack
+    file systems try a second format, so a missing page costs JSON file systems (the default) a single lookup.
+    """
+    if page_content_format == "msgpack":
+        return ["msgpack", "json"]
+    return ["json"]
+
+
+def _page_content_file_names(page_number: int, page_content_format: str) -> List[str]:
+    """
+    The file names a page's text content may be saved under, starting with the one pages are saved in
+    """
+    return [f"page_content_{page_number}.{extension}" for extension in _page_content_extensions(page_content_format)]
+
+
+def _dumps_page_content(content: str, page_content_format: str) -> bytes:
+    """
+    Serialize a page's text content in the given format. As MessagePack, that's just the string. As JSON, it's a
+    `{"content": ...}` document; only the string itself needs encoding, so it's spliced between a fixed prefix
+    and suffix rather than building and serializing a dict.
+    """
+    if page_content_format == "msgpack":
+        return msgpack.packb(content, use_bin_type=True)
+    if orjson is not None:
+        return b'{"content":' + orjson.dumps(content) + b'}'
+    return b'{"content":' + json.dumps(content).encode('utf-8') + b'}'
+
+
+def _loads_page_content(data: bytes, file_name: str) -> str:
+    """
+    Deserialize a page's text content, using the format given by its file name's extension. Raises ImportError
+    for MessagePack pages if msgpack isn't installed, rather than treating the page as missing.
+    """
+    if file_name.endswith(".msgpack"):
+        return msgpack.unpackb(data, raw=False)
+    return _loads_json(data)["content"]
+
+
+def _encode_jpeg(image) -> bytes:
+    """
+    Encode a PIL image as a JPEG
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+def _loads_json(data: bytes):
+    """
+    Deserialize UTF-8 encoded JSON, using orjson when it's installed and it parses the data the same way the json module
+    would. Raises a json.JSONDecodeError on invalid input.
+    """
+    if orjson is not None:
+        try:
+            result = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN and Infinity, which the json module writes and reads
+            return json.loads(data)
+        if _round_trips_through_orjson(result):
+            return result
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=None)
+def is_io_uring_available() -> bool:
+    """
+    Check whether io_uring can be used: we're on Linux, the liburing package is installed and the kernel lets us create a ring
+    """
+    if not sys.platform.startswith("linux") or importlib.util.find_spec("liburing") is None:
+        return False
+    try:
+        ring = liburing.Ring()
+        liburing.io_uring_queue_init(1, ring)
+        liburing.io_uring_queue_exit(ring)
+        return True
+    except Exception:
+        # e.g. io_uring is disabled by the kernel or blocked by a seccomp profile
+        return False
+
+
+# Maximum number of submission queue entries (i.e. files) handled per io_uring batch
+_URING_BATCH_SIZE = 256
+# Size of the buffer each file is read into; anything past it is read with a regular pread.
+# Page content files are usually only a few KB, and larger buffers cost more to allocate than they save.
+_URING_READ_BUFFER_SIZE = 8 * 1024
+
+
+def _uring_submit_batch(ring, cqe, prep, args_list: list) -> list:
+    """
+    Prepare one submission queue entry per item in args_list by calling prep(sqe, *args), submit them all at once
+    and reap every completion. Returns the result of each entry in order, or the OSError it failed with.
+    """
+    get_sqe = liburing.io_uring_get_sqe
+    for i, args in enumerate(args_list):
+        sqe = get_sqe(ring)
+        prep(sqe, *args)
+        sqe.user_data = i
+    liburing.io_uring_submit_and_wait(ring, len(args_list))
+
+    wait_cqe = liburing.io_uring_wait_cqe
+    cqe_seen = liburing.io_uring_cqe_seen
+    results = [None] * len(args_list)
+    for _ in range(len(args_list)):
+        # All of the entries have completed by now, so this only reaps them from the completion queue
+        wait_cqe(ring, cqe)
+        entry = cqe[0]
+        try:
+            results[entry.user_data] = entry.res  # raises the matching OSError if the operation failed
+        except OSError as e:
+            results[entry.user_data] = e
+        cqe_seen(ring, entry)
+    return results
+
+
+def _read_files_io_uring(file_paths: List[str]) -> List[Optional[bytes]]:
+    """
+    Read whole files using io_uring, with one submission for all of the opens, one for the reads and one for the closes
+    (per batch of _URING_BATCH_SIZE files). Returns None for files that don't exist.
+    """
+    contents = []
+    open_flags = liburing.O_RDONLY | liburing.O_CLOEXEC
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(min(len(file_paths), _URING_BATCH_SIZE), ring)
+    try:
+        for batch_start in range(0, len(file_paths), _URING_BATCH_SIZE):
+            batch_paths = file_paths[batch_start:batch_start + _URING_BATCH_SIZE]
+            fds = _uring_submit_batch(ring, cqe, liburing.io_uring_prep_open, [(path, open_flags) for path in batch_paths])
+            open_fds = [fd for fd in fds if isinstance(fd, int)]
+            if not open_fds:
+                # Every file in this batch is missing (or failed to open)
+                for fd in fds:
+                    if not isinstance(fd, FileNotFoundError):
+                        raise fd
+                contents.extend([None] * len(fds))
+                continue
+
+            try:
+                buffers = [bytearray(_URING_READ_BUFFER_SIZE) for _ in open_fds]
+                lengths = _uring_submit_batch(
+                    ring, cqe, liburing.io_uring_prep_read, [(fd, buffer, 0) for fd, buffer in zip(open_fds, buffers)]
+                )
+                file_contents = {}
+                for fd, buffer, length in zip(open_fds, buffers, lengths):
+                    if isinstance(length, Exception):
+                        raise length
+                    data = bytes(buffer[:length])
+                    if length == _URING_READ_BUFFER_SIZE:
+                        # The file may be larger than the buffer, so read the rest of it
+                        chunks = [data]
+                        offset = length
+                        while True:
+                            chunk = os.pread(fd, 1024 * 1024, offset)
+                            if not chunk:
+                                break
+                            chunks.append(chunk)
+                            offset += len(chunk)
+                        data = b"".join(chunks)
+                    file_contents[fd] = data
+            finally:
+                _uring_submit_batch(ring, cqe, liburing.io_uring_prep_close, [(fd,) for fd in open_fds])
+
+            for fd in fds:
+                if isinstance(fd, FileNotFoundError):
+                    contents.append(None)
+                elif isinstance(fd, Exception):
+                    raise fd
+                else:
+                    contents.append(file_contents[fd])
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return contents
+
+
+class _DataCache:
+    """
+    A small thread-safe LRU cache of parsed JSON data. Each entry is stored with a version (e.g. file mtime or S3 ETag),
+    so stale entries can be detected by the caller.
+    """
+    def __init__(self, maxsize: int = DATA_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks can't be pickled, and the cached data isn't worth carrying across processes
+        return {"maxsize": self.maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state["maxsize"])
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return the (version, data) cached for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, version, data) -> None:
+        with self._lock:
+            self._entries[key] = (version, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
 
 class FileSystem(ABC):
     subclasses = {}
@@ -54,10 +398,47 @@ class FileSystem(ABC):
     def save_image(self, kb_id: str, doc_id: str, file_name: str, file: any) -> None:
         pass
 
+    def save_images_bulk(self, kb_id: str, doc_id: str, images: list[tuple[str, any]]) -> None:
+        """Save many images at once
+        Args:
+            kb_id: Knowledge base ID
+            doc_id: Document ID
+            images: List of (file_name, PIL image) pairs
+        """
+        # Default implementation saves the images one at a time; subclasses can parallelize the writes
+        for file_name, image in images:
+            self.save_image(kb_id, doc_id, file_name, image)
+
+    def save_page_image_manifest(self, kb_id: str, doc_id: str, file_names: list[str]) -> None:
+        """Record the complete set of page images saved for a document, once they have all been saved
+        Args:
+            kb_id: Knowledge base ID
+            doc_id: Document ID
+            file_names: File names of the page images (e.g. page_1.jpg)
+        """
+        # Default implementation does nothing; file systems where listing a directory is slow can persist it
+        pass
+
     @abstractmethod
     def get_files(self, kb_id: str, doc_id: str, page_start: int, page_end: int) -> List[str]:
         pass
 
+    def get_files_bytes(self, kb_id: str, doc_id: str, page_start: int, page_end: int) -> dict[int, bytes]:
+        """Get the page image bytes for a range of pages, keyed by page number
+        Args:
+            kb_id: Knowledge base ID
+            doc_id: Document ID
+            page_start: The starting page number
+            page_end: The ending page number (inclusive)
+        """
+        # Default implementation reads back the files returned by get_files; subclasses can avoid the round trip to disk
+        page_images = {}
+        for file_path in self.get_files(kb_id, doc_id, page_start, page_end):
+            page_number = int(_PAGE_IMAGE_RE.search(file_path).group(1))
+            with open(file_path, 'rb') as f:
+                page_images[page_number] = f.read()
+        return page_images
+
     @abstractmethod
     def get_all_jpg_files(self, kb_id: str, doc_id: str) -> List[str]:
         pass
@@ -68,9 +449,20 @@ class FileSystem(ABC):
 
     @abstractmethod
     def save_page_content(self, kb_id: str, doc_id: str, page_number: int, content: str) -> None:
-        """Save the text content of a page to a JSON file"""
+        """Save the text content of a page"""
         pass
 
+    def save_page_contents_bulk(self, kb_id: str, doc_id: str, contents: dict[int, str]) -> None:
+        """Save the text content of many pages at once
+        Args:
+            kb_id: Knowledge base ID
+            doc_id: Document ID
+            contents: Mapping of page number to the text content of that page
+        """
+        # Default implementation saves the pages one at a time; subclasses can batch the writes
+        for page_number, content in contents.items():
+            self.save_page_content(kb_id, doc_id, page_number, content)
+
     @abstractmethod
     def load_page_content(self, kb_id: str, doc_id: str, page_number: int) -> Optional[str]:
         """Load the text content of a page from its JSON file"""
@@ -95,19 +487,35 @@ class FileSystem(ABC):
 class LocalFileSystem(FileSystem):
     """
     Uses the local file system to store and retrieve page image files and other data.
+
+    If use_page_store is True, page content is appended to a single log file per document (see LocalPageStore)
+    instead of being written to one JSON file per page. Pages saved as JSON files can still be loaded either way.
     """
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, use_page_store: bool = False, cache_data: bool = False, page_content_format: str = "json"):
         super().__init__(base_path)
+        self.use_page_store = use_page_store
+        self.cache_data = cache_data
+        self.page_content_format = _check_page_content_format(page_content_format)
+        # Parsed load_data results, validated against each file's mtime and size. A cache of size 0 never holds anything,
+        # so nothing is kept in memory unless caching was asked for
+        self._data_cache = _DataCache(DATA_CACHE_SIZE if cache_data else 0)
+
+    def to_dict(self):
+        base_dict = super().to_dict()
+        base_dict.update({
+            "use_page_store": self.use_page_store,
+            "cache_data": self.cache_data,
+            "page_content_format": self.page_content_format
+        })
+        return base_dict
 
     def create_directory(self, kb_id: str, doc_id: str) -> None:
         """
         Create a directory to store the images of the pages
         """
         page_images_path = os.path.join(self.base_path, kb_id, doc_id)
-        if os.path.exists(page_images_path):
-            for file in os.listdir(page_images_path):
-                os.remove(os.path.join(page_images_path, file))
-            os.rmdir(page_images_path)
+        # Remove anything left over from a previous version of the document
+        shutil.rmtree(page_images_path, ignore_errors=True)
 
         # Create the folder
         os.makedirs(page_images_path, exist_ok=False)
@@ -117,22 +525,14 @@ class LocalFileSystem(FileSystem):
         Delete the directory
         """
         page_images_path = os.path.join(self.base_path, kb_id, doc_id)
-
-        # make sure the path exists and is a directory
-        if os.path.exists(page_images_path) and os.path.isdir(page_images_path):
-            for file in os.listdir(page_images_path):
-                os.remove(os.path.join(page_images_path, file))
-            os.rmdir(page_images_path)
+        shutil.rmtree(page_images_path, ignore_errors=True)
 
     def delete_kb(self, kb_id: str) -> None:
         """
         Delete the knowledge base
         """
         kb_path = os.path.join(self.base_path, kb_id)
-        if os.path.exists(kb_path):
-            for doc_id in os.listdir(kb_path):
-                self.delete_directory(kb_id, doc_id)
-            self.delete_directory(kb_id, "")
+        shutil.rmtree(kb_path, ignore_errors=True)
 
     def save_json(self, kb_id: str, doc_id: str, file_name: str, file: dict) -> None:
         """
@@ -140,8 +540,9 @@ class LocalFileSystem(FileSystem):
         """
 
         file_path = os.path.join(self.base_path, kb_id, doc_id, file_name)
-        with open(file_path, "w") as f:
-            json.dump(file, f, indent=2)
+        with open(file_path, "wb") as f:
+            f.write(_dumps_json(file, indent=True))
+        self._data_cache.pop(file_path)
         
     def save_image(self, kb_id: str, doc_id: str, file_name: str, image: any) -> None:
         """
@@ -150,6 +551,17 @@ class LocalFileSystem(FileSystem):
         image_path = os.path.join(self.base_path, kb_id, doc_id, file_name)
         image.save(image_path)
 
+    def save_images_bulk(self, kb_id: str, doc_id: str, images: list[tuple[str, any]]) -> None:
+        """
+        Save many images to the local system, encoding them concurrently
+        """
+        if not images:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(IMAGE_ENCODE_MAX_WORKERS, len(images))) as executor:
+            # Consume the results so that the first failed save is raised here
+            list(executor.map(lambda item: self.save_image(kb_id, doc_id, item[0], item[1]), images))
+
     def get_files(self, kb_id: str, doc_id: str, page_start: int, page_end: int) -> List[str]:
         """
         Get the file from the local system
@@ -159,17 +571,49 @@ class LocalFileSystem(FileSystem):
         if page_start is None or page_end is None:
             return []
         page_images_path = os.path.join(self.base_path, kb_id, doc_id)
+        try:
+            # List the directory once instead of checking every extension of every page
+            page_images = _map_page_images(os.listdir(page_images_path))
+        except FileNotFoundError:
+            return []
+
+        # Join the document directory once; the page image names are plain file names, so appending them is equivalent
         image_file_paths = []
-        
-        # Try multiple extensions for backward compatibility, but only return first found per page
         for i in range(page_start, page_end + 1):
-            for ext in ['.jpg', '.jpeg', '.png']:  # Try in order of preference
-                image_file_path = os.path.join(page_images_path, f'page_{i}{ext}')
-                if os.path.exists(image_file_path):
-                    image_file_paths.append(image_file_path)
-                    break  # Found the file, no need to check other extensions
+            if i in page_images:
+                image_file_paths.append(f"{page_images_path}{os.sep}{page_images[i]}")
                     
         return image_file_paths
+
+    def get_files_bytes(self, kb_id: str, doc_id: str, page_start: int, page_end: int) -> dict[int, bytes]:
+        """
+        Get the page image bytes for a range of pages, keyed by page number
+        - page_start: int - the starting page number
+        - page_end: int - the ending page number (inclusive)
+        """
+        if page_start is None or page_end is None:
+            return {}
+        page_images_path = os.path.join(self.base_path, kb_id, doc_id)
+        if page_start == page_end:
+            # A single page (e.g. from parse_page) is almost always saved as a JPG, so read it without listing the directory
+            try:
+                with open(f"{page_images_path}{os.sep}page_{page_start}.jpg", 'rb') as f:
+                    return {page_start: f.read()}
+            except FileNotFoundError:
+                # Saved in another format (older documents), or it doesn't exist
+                pass
+
+        try:
+            page_images = _map_page_images(os.listdir(page_images_path))
+        except FileNotFoundError:
+            return {}
+
+        page_images_bytes = {}
+        for i in range(page_start, page_end + 1):
+            if i in page_images:
+                with open(f"{page_images_path}{os.sep}{page_images[i]}", 'rb') as f:
+                    page_images_bytes[i] = f.read()
+        return page_images_bytes
     
     def get_all_jpg_files(self, kb_id: str, doc_id: str) -> List[str]:
         """
@@ -177,63 +621,136 @@ class LocalFileSystem(FileSystem):
         """
         page_images_path = os.path.join(self.base_path, kb_id, doc_id)
         image_file_paths = []
-        for file in os.listdir(page_images_path):
-            # Make sure the file is an image (support multiple formats for backward compatibility)
-            if not (file.endswith('.jpg') or file.endswith('.jpeg') or file.endswith('.png')):
-                continue
-            image_file_paths.append(os.path.join(page_images_path, file))
+        with os.scandir(page_images_path) as entries:
+            for entry in entries:
+                # Make sure the file is an image (support multiple formats for backward compatibility)
+                if not entry.name.endswith(_IMG_EXTS):
+                    continue
+                image_file_paths.append(f"{page_images_path}{os.sep}{entry.name}")
 
         # Sort the files by page number
-        image_file_paths.sort(key=lambda x: int(x.split('_')[-1].split('.')[0]))
-        return image_file_paths
+        return _sort_by_page_number(image_file_paths)
     
     def log_error(self, kb_id: str, doc_id: str, error: dict) -> None:
         pass
 
+    def _page_store(self, kb_id: str, doc_id: str) -> LocalPageStore:
+        return LocalPageStore(os.path.join(self.base_path, kb_id, doc_id))
+
     def save_page_content(self, kb_id: str, doc_id: str, page_number: int, content: str) -> None:
-        """Save the text content of a page to a JSON file"""
-        page_content_path = os.path.join(self.base_path, kb_id, doc_id, f'page_content_{page_number}.json')
-        with open(page_content_path, 'w') as f:
-            json.dump({"content": content}, f)
+        """Save the text content of a page to its own file (or to the page store if it's enabled)"""
+        if self.use_page_store:
+            self._page_store(kb_id, doc_id).append({page_number: content})
+            return
+
+        file_name = _page_content_file_names(page_number, self.page_content_format)[0]
+        page_content_path = os.path.join(self.base_path, kb_id, doc_id, file_name)
+        data = _dumps_page_content(content, self.page_content_format)
+        with open(page_content_path, 'wb') as f:
+            f.write(data)
+
+    def save_page_contents_bulk(self, kb_id: str, doc_id: str, contents: dict[int, str]) -> None:
+        """Save the text content of many pages, appending them to the page store in one write if it's enabled"""
+        if self.use_page_store:
+            self._page_store(kb_id, doc_id).append(contents)
+        else:
+            super().save_page_contents_bulk(kb_id, doc_id, contents)
 
     def load_page_content(self, kb_id: str, doc_id: str, page_number: int) -> Optional[str]:
-        """Load the text content of a page from its JSON file"""
-        page_content_path = os.path.join(self.base_path, kb_id, doc_id, f'page_content_{page_number}.json')
-        try:
-            with open(page_content_path, 'r') as f:
-                data = json.load(f)
-                return data["content"]
-        except FileNotFoundError:
-            return None
+        """Load the text content of a page from the page store (if it's enabled) or its own file"""
+        if self.use_page_store:
+            content = self._page_store(kb_id, doc_id).load(page_number)
+            if content is not None:
+                return content
+
+        return self._load_page_content_file(kb_id, doc_id, page_number)
+
+    def _load_page_content_file(self, kb_id: str, doc_id: str, page_number: int) -> Optional[str]:
+        """Load the text content of a page from its own file, in whichever format it was saved in"""
+        doc_path = os.path.join(self.base_path, kb_id, doc_id)
+        for file_name in _page_content_file_names(page_number, self.page_content_format):
+            try:
+                with open(os.path.join(doc_path, file_name), 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            return _loads_page_content(data, file_name)
+        return None
 
     def load_page_content_range(self, kb_id: str, doc_id: str, page_start: int, page_end: int) -> list[str]:
         """Load the text content for a range of pages"""
-        page_contents = []
-        for page_num in range(page_start, page_end + 1):
-            content = self.load_page_content(kb_id, doc_id, page_num)
+        stored_contents = {}
+        if self.use_page_store:
+            stored_contents = self._page_store(kb_id, doc_id).load_range(page_start, page_end)
+
+        missing_pages = [i for i in range(page_start, page_end + 1) if i not in stored_contents]
+        stored_contents.update(self._load_page_content_files(kb_id, doc_id, missing_pages))
+        return [stored_contents[i] for i in range(page_start, page_end + 1) if i in stored_contents]
+
+    def _load_page_content_files(self, kb_id: str, doc_id: str, page_numbers: List[int]) -> dict[int, str]:
+        """Load the text content of several pages from their own files, keyed by page number"""
+        page_contents = {}
+        for page_num in page_numbers:
+            content = self._load_page_content_file(kb_id, doc_id, page_num)
             if content is not None:
-                page_contents.append(content)
+                page_contents[page_num] = content
         return page_contents
 
     def load_data(self, kb_id: str, doc_id: str, data_name: str) -> Optional[dict]:
-        """Load JSON data from a file in the local filesystem"""
+        """
+        Load JSON data from a file in the local filesystem. If cache_data is enabled, results are cached until the file
+        changes, so the returned data is shared between calls and should not be modified.
+        """
         file_path = os.path.join(self.base_path, kb_id, doc_id, f"{data_name}.json")
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            stat = os.stat(file_path)
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = self._data_cache.get(file_path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            with open(file_path, 'rb') as f:
+                data = _loads_json(f.read())
+            self._data_cache.put(file_path, version, data)
+            return data
         except FileNotFoundError:
-            print(f"File not found: {file_path}")
+            logger.debug("File not found: %s", file_path)
             return None
         except json.JSONDecodeError as e:
-            print(f"Error decoding JSON from {file_path}: {str(e)}")
+            logger.error("Error decoding JSON from %s: %s", file_path, e)
             return None
 
 
+class UringFileSystem(LocalFileSystem):
+    """
+    A LocalFileSystem that uses io_uring (via the optional liburing package) to read page content files in bulk on Linux.
+
+    Loading a range of pages submits all of the opens, reads and closes as three batches, instead of making
+    separate open/read/close syscalls for every page. Falls back to LocalFileSystem behavior if io_uring isn't available.
+    """
+    def _load_page_content_files(self, kb_id: str, doc_id: str, page_numbers: List[int]) -> dict[int, str]:
+        if not page_numbers or not is_io_uring_available():
+            return super()._load_page_content_files(kb_id, doc_id, page_numbers)
+
+        page_content_path = os.path.join(self.base_path, kb_id, doc_id)
+        page_contents = {}
+        # Read every page in the format pages are saved in first, then only the pages that are missing in each other format
+        for extension in _page_content_extensions(self.page_content_format):
+            missing_pages = [i for i in page_numbers if i not in page_contents]
+            if not missing_pages:
+                break
+            file_paths = [os.path.join(page_content_path, f'page_content_{i}.{extension}') for i in missing_pages]
+            for page_num, file_path, data in zip(missing_pages, file_paths, _read_files_io_uring(file_paths)):
+                if data is not None:
+                    page_contents[page_num] = _loads_page_content(data, file_path)
+        return page_contents
+
+
 class S3FileSystem(FileSystem):
     """
     Uses S3 and DynamoDB to store and retrieve page image files and other data.
     """
-    def __init__(self, base_path: str, bucket_name: str, region_name: str, access_key: str, secret_key: str, error_table: str = None, dynamodb_table_name: str = None, dynamodb_client_data_table_name: str = None):
+    def __init__(self, base_path: str, bucket_name: str, region_name: str, access_key: str, secret_key: str, error_table: str = None, dynamodb_table_name: str = None, dynamodb_client_data_table_name: str = None, cache_data: bool = False, page_content_format: str = "json"):
         super().__init__(base_path)
         self.bucket_name = bucket_name
         self.region_name = region_name
@@ -242,14 +759,59 @@ class S3FileSystem(FileSystem):
         self.error_table = error_table
         self.dynamodb_table_name = dynamodb_table_name
         self.dynamodb_client_data_table_name = dynamodb_client_data_table_name
+        self.cache_data = cache_data
+        self.page_content_format = _check_page_content_format(page_content_format)
+        # boto3 sessions, clients and resources are created lazily and reused across calls,
+        # so each instance keeps a single connection pool instead of building a new client per request
+        self._session = None
+        self._s3_client = None
+        self._dynamodb_resource = None
+        self._client_lock = threading.Lock()
+        # Local download directories that are known to exist, so they are only created once
+        self._created_dirs: set[str] = set()
+        # Parsed load_data results, revalidated against each object's ETag (only kept if cache_data is enabled)
+        self._data_cache = _DataCache(DATA_CACHE_SIZE if cache_data else 0)
+
+    def __getstate__(self):
+        # boto3 objects can't be pickled, so drop them and rebuild them lazily after unpickling
+        state = self.__dict__.copy()
+        state["_session"] = None
+        state["_s3_client"] = None
+        state["_dynamodb_resource"] = None
+        del state["_client_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._client_lock = threading.Lock()
+
+    def _get_session(self):
+        # Must be called while holding self._client_lock, since boto3 sessions are not thread-safe
+        if self._session is None:
+            self._session = boto3.session.Session(
+                region_name=self.region_name,
+                aws_access_key_id=self.access_key,
+                aws_secret_access_key=self.secret_key
+            )
+        return self._session
 
     def create_s3_client(self):
-        return boto3.client(
-            service_name='s3',
-            region_name=self.region_name,
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_key
-        )
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    # Size the connection pool for the number of threads that share the client
+                    self._s3_client = self._get_session().client(
+                        service_name='s3',
+                        config=botocore.config.Config(max_pool_connections=S3_MAX_WORKERS)
+                    )
+        return self._s3_client
+
+    def create_dynamodb_resource(self):
+        if self._dynamodb_resource is None:
+            with self._client_lock:
+                if self._dynamodb_resource is None:
+                    self._dynamodb_resource = self._get_session().resource('dynamodb')
+        return self._dynamodb_resource
 
     def create_directory(self, kb_id: str, doc_id: str) -> None:
         """
@@ -261,51 +823,46 @@ class S3FileSystem(FileSystem):
         """
         Delete the directory in S3. Used when deleting a document.
         """
-        
-        s3_client = self.create_s3_client()
-        prefix = f"{kb_id}/{doc_id}/"
-
-        # List all objects with the specified prefix
-        response = s3_client.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix)
-
-        # Check if there are any objects to delete
-        if 'Contents' in response:
-            # Prepare a list of object keys to delete
-            objects_to_delete = [{'Key': obj['Key']} for obj in response['Contents']]
-
-            # Delete the objects
-            s3_client.delete_objects(Bucket=self.bucket_name, Delete={'Objects': objects_to_delete})
-            print(f"Deleted all objects in {prefix} from {self.bucket_name}.")
-        else:
-            print(f"No objects found in {prefix}.")
-            objects_to_delete = []
-
-        return objects_to_delete
-    
+        return self._delete_prefix(f"{kb_id}/{doc_id}/")
 
-    def delete_kb(self, kb_id: str) -> None:
+    def delete_kb(self, kb_id: str) -> List[dict]:
         """
         Delete the knowledge base
         """
+        return self._delete_prefix(f"{kb_id}/")
+
+    def _delete_prefix(self, prefix: str) -> List[dict]:
+        """
+        Delete every object with the given prefix, returning the objects that were deleted
+        """
+        # List all objects with the specified prefix (following pagination, since each listing returns at most 1000 keys)
+        objects_to_delete = [{'Key': key} for key in self._list_keys(prefix)]
+        if not objects_to_delete:
+            logger.debug("No objects found in %s.", prefix)
+            return []
+
+        # Delete the objects in batches of up to 1000 keys, issuing the batches concurrently
+        batches = [
+            objects_to_delete[i:i + S3_DELETE_BATCH_SIZE]
+            for i in range(0, len(objects_to_delete), S3_DELETE_BATCH_SIZE)
+        ]
         s3_client = self.create_s3_client()
-        prefix = f"{kb_id}/"
-
-        # List all objects with the specified prefix
-        response = s3_client.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix)
-        # Check if there are any objects to delete
-        if 'Contents' in response:
-            # Prepare a list of object keys to delete
-            objects_to_delete = [{'Key': obj['Key']} for obj in response['Contents']]
-
-            # Delete the objects
-            s3_client.delete_objects(Bucket=self.bucket_name, Delete={'Objects': objects_to_delete})
-            print(f"Deleted all objects in {prefix} from {self.bucket_name}.")
-        else:
-            print(f"No objects found in {prefix}.")
-            objects_to_delete = []
-        
-        return objects_to_delete
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(S3_DELETE_MAX_WORKERS, len(batches))) as executor:
+            responses = list(executor.map(
+                lambda batch: s3_client.delete_objects(Bucket=self.bucket_name, Delete={'Objects': batch}),
+                batches
+            ))
 
+        failed_keys = set()
+        for response in responses:
+            for error in response.get('Errors', []):
+                failed_keys.add(error['Key'])
+                logger.error("Failed to delete %s from %s: %s %s", error['Key'], self.bucket_name, error.get('Code'), error.get('Message'))
+
+        if failed_keys:
+            return [obj for obj in objects_to_delete if obj['Key'] not in failed_keys]
+        logger.debug("Deleted all objects in %s from %s.", prefix, self.bucket_name)
+        return objects_to_delete
 
     def save_json(self, kb_id: str, doc_id: str, file_name: str, file: dict) -> None:
         """
@@ -313,7 +870,7 @@ class S3FileSystem(FileSystem):
         """
 
         file_name = f"{kb_id}/{doc_id}/{file_name}"
-        json_data = json.dumps(file, indent=2)  # Serialize the JSON data
+        json_data = _dumps_json(file, indent=True)  # Serialize the JSON data
 
         s3_client = self.create_s3_client()
         try:
@@ -323,7 +880,8 @@ class S3FileSystem(FileSystem):
                 Body=json_data,
                 ContentType='application/json'
             )
-            print(f"JSON data uploaded to {self.bucket_name}/{file_name}.")
+            self._data_cache.pop(file_name)
+            logger.debug("JSON data uploaded to %s/%s.", self.bucket_name, file_name)
         except Exception as e:
             raise RuntimeError(f"Failed to upload JSON to S3.") from e
 
@@ -331,20 +889,37 @@ class S3FileSystem(FileSystem):
         """
         Upload the file to S3
         """
-        file_name = f"{kb_id}/{doc_id}/{file_name}"
-        buffer = io.BytesIO()
-        file.save(buffer, format='JPEG')
-        buffer.seek(0)  # Rewind the buffer to the beginning
+        self._put_image(f"{kb_id}/{doc_id}/{file_name}", _encode_jpeg(file))
+
+    def save_images_bulk(self, kb_id: str, doc_id: str, images: list[tuple[str, any]]) -> None:
+        """
+        Upload many images to S3. The images are JPEG encoded on a small pool of threads, and each one is
+        uploaded as soon as it's encoded, so encoding overlaps with the uploads.
+        """
+        if not images:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(IMAGE_ENCODE_MAX_WORKERS, len(images))) as encoder, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=min(S3_MAX_WORKERS, len(images))) as uploader:
+            encoded = {encoder.submit(_encode_jpeg, image): file_name for file_name, image in images}
+            uploads = [
+                uploader.submit(self._put_image, f"{kb_id}/{doc_id}/{encoded[future]}", future.result())
+                for future in concurrent.futures.as_completed(encoded)
+            ]
+            # Raise the first failed upload here
+            for future in uploads:
+                future.result()
 
+    def _put_image(self, s3_key: str, data: bytes) -> None:
         s3_client = self.create_s3_client()
         try:
             s3_client.put_object(
                 Bucket=self.bucket_name,
-                Key=file_name,
-                Body=buffer,
+                Key=s3_key,
+                Body=data,
                 ContentType='image/jpeg'
             )
-            print(f"JPEG uploaded to {self.bucket_name}/{file_name}.")
+            logger.debug("JPEG uploaded to %s/%s.", self.bucket_name, s3_key)
         except Exception as e:
             raise RuntimeError(f"Failed to upload image to S3.") from e
 
@@ -358,39 +933,65 @@ class S3FileSystem(FileSystem):
         if page_start is None or page_end is None:
             return []
         
-        s3_client = self.create_s3_client()
-        file_paths = []
-        
-        # Try multiple extensions for backward compatibility, but only return first found per page
+        # Look up the document's page images once instead of probing every extension of every page
+        try:
+            page_keys = _map_page_images(self._list_page_image_keys(kb_id, doc_id))
+        except Exception as e:
+            logger.error("Error listing files from S3: %s", e)
+            return []
+        s3_keys = []
         for i in range(page_start, page_end + 1):
-            found_file = False
-            for ext in ['.jpg', '.jpeg', '.png']:  # Try in order of preference
-                filename = f"{kb_id}/{doc_id}/page_{i}{ext}"
-                output_folder = os.path.join(self.base_path, kb_id, doc_id)
-                if not os.path.exists(output_folder):
-                    try:
-                        os.makedirs(output_folder)
-                    except FileExistsError:
-                        # Since this function can be called in parallel, the folder may have been created by another process
-                        pass
-                output_filepath = os.path.join(self.base_path, filename)
-                try:
-                    s3_client.download_file(
-                        self.bucket_name,
-                        filename,
-                        output_filepath
-                    )
-                    file_paths.append(output_filepath)
-                    found_file = True
-                    break  # Found file for this page, don't try other extensions
-                except Exception as e:
-                    # File doesn't exist with this extension, try next extension
-                    continue
-            
-            if not found_file:
-                print(f"Warning: No image file found for page {i} in S3")
-            
-        return file_paths
+            if i in page_keys:
+                s3_keys.append(page_keys[i])
+            else:
+                logger.warning("No image file found for page %s in S3", i)
+        if not s3_keys:
+            return []
+
+        self._ensure_local_directory(kb_id, doc_id)
+
+        # Download the pages concurrently; map preserves the page order
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(S3_MAX_WORKERS, len(s3_keys))) as executor:
+            results = executor.map(self._download_file, s3_keys)
+            return [file_path for file_path in results if file_path is not None]
+
+    def get_files_bytes(self, kb_id: str, doc_id: str, page_start: int, page_end: int) -> dict[int, bytes]:
+        """
+        Get the page image bytes for a range of pages from S3, keyed by page number, without writing them to disk
+        - page_start: int - the starting page number
+        - page_end: int - the ending page number (inclusive)
+        """
+        if page_start is None or page_end is None:
+            return {}
+
+        if page_start == page_end:
+            # A single page (e.g. from parse_page) is almost always saved as a JPG, so fetch it by its key directly
+            # rather than looking up the document's page images first
+            s3_client = self.create_s3_client()
+            s3_key = f"{kb_id}/{doc_id}/page_{page_start}.jpg"
+            try:
+                response = s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+                return {page_start: response['Body'].read()}
+            except s3_client.exceptions.NoSuchKey:
+                # Saved in another format (older documents), or it doesn't exist
+                pass
+            except Exception as e:
+                logger.error("Error downloading file %s: %s", s3_key, e)
+                return {}
+
+        try:
+            page_keys = _map_page_images(self._list_page_image_keys(kb_id, doc_id))
+        except Exception as e:
+            logger.error("Error listing files from S3: %s", e)
+            return {}
+        pages = [i for i in range(page_start, page_end + 1) if i in page_keys]
+        if not pages:
+            return {}
+
+        # Fetch the pages concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(S3_MAX_WORKERS, len(pages))) as executor:
+            results = executor.map(lambda i: self._get_object_bytes(page_keys[i]), pages)
+            return {i: data for i, data in zip(pages, results) if data is not None}
     
     def get_all_jpg_files(self, kb_id: str, doc_id: str) -> List[str]:
         """
@@ -404,50 +1005,123 @@ class S3FileSystem(FileSystem):
         Returns:
             List[str]: Sorted list of local file paths for the downloaded images
         """
-        prefix = f"{kb_id}/{doc_id}/"
-        s3_client = self.create_s3_client()
-        
         try:
-            # List all objects with the specified prefix
-            response = s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
+            # Use the document's manifest if it has one, otherwise list all objects with its prefix
+            keys = self._list_page_image_keys(kb_id, doc_id)
             
-            if 'Contents' not in response:
+            if not keys:
                 return []
             
             # Filter for image files (support multiple formats for backward compatibility)
-            jpg_files = [obj['Key'] for obj in response['Contents'] 
-                        if obj['Key'].lower().endswith(('.jpg', '.jpeg', '.png'))]
+            jpg_files = [key for key in keys
+                        if key.lower().endswith(_IMG_EXTS)]
             
             # Create local directory if it doesn't exist
-            output_folder = os.path.join(self.base_path, kb_id, doc_id)
-            os.makedirs(output_folder, exist_ok=True)
+            self._ensure_local_directory(kb_id, doc_id)
             
-            # Download each file
+            # Download the files concurrently
             local_file_paths = []
-            for s3_key in jpg_files:
-                local_path = os.path.join(self.base_path, s3_key)
-                try:
-                    s3_client.download_file(
-                        self.bucket_name,
-                        s3_key,
-                        local_path
-                    )
-                    local_file_paths.append(local_path)
-                except Exception as e:
-                    print(f"Error downloading file {s3_key}: {e}")
-                    continue
+            if jpg_files:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(S3_MAX_WORKERS, len(jpg_files))) as executor:
+                    results = executor.map(self._download_file, jpg_files)
+                    local_file_paths = [local_path for local_path in results if local_path is not None]
             
             # Sort the files by page number, similar to LocalFileSystem
-            local_file_paths.sort(key=lambda x: int(x.split('_')[-1].split('.')[0]))
-            return local_file_paths
+            return _sort_by_page_number(local_file_paths)
             
         except Exception as e:
-            print(f"Error listing/downloading files from S3: {e}")
+            logger.error("Error listing/downloading files from S3: %s", e)
             return []
-        
+
+    def _ensure_local_directory(self, kb_id: str, doc_id: str) -> str:
+        """
+        Create the local directory that files for this document are downloaded to, if it hasn't been created already
+        """
+        output_folder = os.path.join(self.base_path, kb_id, doc_id)
+        if output_folder not in self._created_dirs:
+            # exist_ok since this function can be called in parallel, so another thread or process may have created it
+            os.makedirs(output_folder, exist_ok=True)
+            self._created_dirs.add(output_folder)
+        return output_folder
+
+    def save_page_image_manifest(self, kb_id: str, doc_id: str, file_names: list[str]) -> None:
+        """
+        Upload manifest.json, listing the keys of the document's page images in page order, so they can be looked up
+        with a single GET instead of listing the document's prefix
+        """
+        manifest = [
+            {"key": f"{kb_id}/{doc_id}/{file_name}", "page": int(_PAGE_NUMBER_RE.search(file_name).group(1))}
+            for file_name in file_names
+            if _PAGE_NUMBER_RE.search(file_name)
+        ]
+        manifest.sort(key=operator.itemgetter("page"))
+
+        s3_client = self.create_s3_client()
+        try:
+            s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=f"{kb_id}/{doc_id}/{PAGE_IMAGE_MANIFEST_NAME}",
+                Body=_dumps_json(manifest),
+                ContentType='application/json'
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to upload page image manifest to S3.") from e
+
+    def _list_page_image_keys(self, kb_id: str, doc_id: str) -> List[str]:
+        """
+        Get the keys of the document's page images from its manifest, or by listing its prefix
+        if it doesn't have one (e.g. documents ingested before manifests were written)
+        """
+        s3_client = self.create_s3_client()
+        s3_key = f"{kb_id}/{doc_id}/{PAGE_IMAGE_MANIFEST_NAME}"
+        try:
+            response = s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+            return [entry["key"] for entry in _loads_json(response['Body'].read())]
+        except s3_client.exceptions.NoSuchKey:
+            pass
+        except Exception as e:
+            # Don't mask e.g. permission errors or a corrupt manifest by silently listing instead
+            raise RuntimeError(f"Failed to load page image manifest {s3_key}: {e}") from e
+
+        return self._list_keys(f"{kb_id}/{doc_id}/")
+
+    def _list_keys(self, prefix: str) -> List[str]:
+        """
+        List the keys of all objects with the given prefix, following pagination
+        """
+        s3_client = self.create_s3_client()
+        paginator = s3_client.get_paginator('list_objects_v2')
+        keys = []
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            keys.extend(obj['Key'] for obj in page.get('Contents', []))
+        return keys
+
+    def _download_file(self, s3_key: str) -> Optional[str]:
+        """
+        Download a single object to the same relative path under base_path, returning the local path or None on failure
+        """
+        local_path = os.path.join(self.base_path, s3_key)
+        try:
+            self.create_s3_client().download_file(
+                self.bucket_name,
+                s3_key,
+                local_path
+            )
+            return local_path
+        except Exception as e:
+            logger.error("Error downloading file %s: %s", s3_key, e)
+            return None
+    
+    def _get_object_bytes(self, s3_key: str) -> Optional[bytes]:
+        """
+        Read a single object into memory, returning None on failure
+        """
+        try:
+            response = self.create_s3_client().get_object(Bucket=self.bucket_name, Key=s3_key)
+            return response['Body'].read()
+        except Exception as e:
+            logger.error("Error downloading file %s: %s", s3_key, e)
+            return None
     
     def log_error(self, kb_id: str, doc_id: str, error: dict) -> None:
         if self.error_table is None:
@@ -455,12 +1129,7 @@ class S3FileSystem(FileSystem):
         
         # Create a uuid for this error
         timestamp = datetime.now().isoformat()
-        dynamodb_client = boto3.resource(
-            'dynamodb',
-            region_name=self.region_name,
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_key
-        )
+        dynamodb_client = self.create_dynamodb_resource()
         table = dynamodb_client.Table(self.error_table)
         item = {
             'client_id': kb_id,
@@ -472,8 +1141,8 @@ class S3FileSystem(FileSystem):
 
     def save_page_content(self, kb_id: str, doc_id: str, page_number: int, content: str) -> None:
         """Save the text content of a page to S3"""
-        file_name = f"{kb_id}/{doc_id}/page_content_{page_number}.json"
-        data = json.dumps({"content": content})
+        file_name = f"{kb_id}/{doc_id}/{_page_content_file_names(page_number, self.page_content_format)[0]}"
+        data = _dumps_page_content(content, self.page_content_format)
 
         s3_client = self.create_s3_client()
         try:
@@ -481,34 +1150,51 @@ class S3FileSystem(FileSystem):
                 Bucket=self.bucket_name,
                 Key=file_name,
                 Body=data,
-                ContentType='application/json'
+                ContentType=_PAGE_CONTENT_TYPES[self.page_content_format]
             )
         except Exception as e:
             raise RuntimeError(f"Failed to upload page content to S3.") from e
 
+    def save_page_contents_bulk(self, kb_id: str, doc_id: str, contents: dict[int, str]) -> None:
+        """Save the text content of many pages to S3, uploading them concurrently"""
+        if not contents:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(S3_MAX_WORKERS, len(contents))) as executor:
+            # Consume the results so that the first failed upload is raised here
+            list(executor.map(
+                lambda item: self.save_page_content(kb_id, doc_id, item[0], item[1]),
+                contents.items()
+            ))
+
     def load_page_content(self, kb_id: str, doc_id: str, page_number: int) -> Optional[str]:
         """Load the text content of a page from S3"""
-        file_name = f"{kb_id}/{doc_id}/page_content_{page_number}.json"
         s3_client = self.create_s3_client()
-        
-        try:
-            response = s3_client.get_object(Bucket=self.bucket_name, Key=file_name)
-            data = json.loads(response['Body'].read().decode('utf-8'))
-            return data["content"]
-        except s3_client.exceptions.NoSuchKey:
-            return None
-        except Exception as e:
-            print(f"Error loading page content from S3: {e}")
-            return None
+
+        # Try each format the page may have been saved in
+        for file_name in _page_content_file_names(page_number, self.page_content_format):
+            try:
+                response = s3_client.get_object(Bucket=self.bucket_name, Key=f"{kb_id}/{doc_id}/{file_name}")
+                data = response['Body'].read()
+            except s3_client.exceptions.NoSuchKey:
+                continue
+            except Exception as e:
+                logger.error("Error loading page content from S3: %s", e)
+                return None
+            # Decoded outside the try, so a missing msgpack install raises instead of looking like a missing page
+            return _loads_page_content(data, file_name)
+        return None
 
     def load_page_content_range(self, kb_id: str, doc_id: str, page_start: int, page_end: int) -> list[str]:
         """Load the text content for a range of pages from S3"""
-        page_contents = []
-        for page_num in range(page_start, page_end + 1):
-            content = self.load_page_content(kb_id, doc_id, page_num)
-            if content is not None:
-                page_contents.append(content)
-        return page_contents
+        page_numbers = range(page_start, page_end + 1)
+        if not page_numbers:
+            return []
+
+        # Fetch the pages concurrently; map preserves the page order
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(S3_MAX_WORKERS, len(page_numbers))) as executor:
+            results = executor.map(lambda i: self.load_page_content(kb_id, doc_id, i), page_numbers)
+            return [content for content in results if content is not None]
     
     def to_dict(self):
         base_dict = super().to_dict()
@@ -517,24 +1203,170 @@ class S3FileSystem(FileSystem):
             "region_name": self.region_name,
             "access_key": self.access_key,
             "secret_key": self.secret_key,
-            "error_table": self.error_table
+            "error_table": self.error_table,
+            "cache_data": self.cache_data,
+            "page_content_format": self.page_content_format
         })
         return base_dict
 
     def load_data(self, kb_id: str, doc_id: str, data_name: str) -> Optional[dict]:
-        """Load JSON data from a file in S3"""
+        """
+        Load JSON data from a file in S3. If cache_data is enabled, results are cached and revalidated with a conditional
+        GET on the object's ETag, so the returned data is shared between calls and should not be modified.
+        """
         s3_key = f"{kb_id}/{doc_id}/{data_name}.json"
         s3_client = self.create_s3_client()
+        cached = self._data_cache.get(s3_key)
         
         try:
-            response = s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
-            return json.loads(response['Body'].read().decode('utf-8'))
+            if cached is not None:
+                response = s3_client.get_object(Bucket=self.bucket_name, Key=s3_key, IfNoneMatch=cached[0])
+            else:
+                response = s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+            data = _loads_json(response['Body'].read())
+            self._data_cache.put(s3_key, response['ETag'], data)
+            return data
         except s3_client.exceptions.NoSuchKey:
-            print(f"File not found in S3: {s3_key}")
+            logger.debug("File not found in S3: %s", s3_key)
             return None
         except json.JSONDecodeError as e:
-            print(f"Error decoding JSON from S3 file {s3_key}: {str(e)}")
+            logger.error("Error decoding JSON from S3 file %s: %s", s3_key, e)
+            return None
+        except s3_client.exceptions.ClientError as e:
+            if cached is not None and e.response['Error']['Code'] == '304':
+                # Not modified since it was cached
+                return cached[1]
+            logger.error("Error loading data from S3: %s", e)
+            return None
+        except Exception as e:
+            logger.error("Error loading data from S3: %s", e)
             return None
+
+
+class AsyncS3FileSystem(S3FileSystem):
+    """
+    An S3FileSystem that uses aiobotocore (an optional dependency) to issue many requests concurrently from a single
+    asyncio event loop, rather than one thread per in-flight request.
+
+    The `a`-prefixed coroutines (aload_page_content_range, asave_page_contents_bulk, aload_page_content,
+    asave_page_content, aload_data) can be awaited directly from async code. All of the synchronous methods are
+    inherited from S3FileSystem: running a coroutine from synchronous code would need a new event loop and
+    aiobotocore client (and so new connections) per call, which is no faster than the cached boto3 client's thread pool.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._async_session = None
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_async_session"] = None
+        return state
+
+    def create_async_s3_client(self):
+        """
+        Create an aiobotocore S3 client. This returns an async context manager, since aiobotocore clients are bound
+        to the event loop they're used on: `async with file_system.create_async_s3_client() as client: ...`
+        """
+        if self._async_session is None:
+            self._async_session = aiobotocore.session.get_session()
+        return self._async_session.create_client(
+            's3',
+            region_name=self.region_name,
+            aws_access_key_id=self.access_key,
+            aws_secret_access_key=self.secret_key,
+            config=aiobotocore.config.AioConfig(max_pool_connections=S3_MAX_WORKERS)
+        )
+
+    async def _aget_page_content(self, client, kb_id: str, doc_id: str, page_number: int) -> Optional[str]:
+        # Try each format the page may have been saved in
+        for file_name in _page_content_file_names(page_number, self.page_content_format):
+            try:
+                response = await client.get_object(Bucket=self.bucket_name, Key=f"{kb_id}/{doc_id}/{file_name}")
+                async with response['Body'] as stream:
+                    data = await stream.read()
+            except client.exceptions.NoSuchKey:
+                continue
+            except Exception as e:
+                logger.error("Error loading page content from S3: %s", e)
+                return None
+            # Decoded outside the try, so a missing msgpack install raises instead of looking like a missing page
+            return _loads_page_content(data, file_name)
+        return None
+
+    async def _aput_page_content(self, client, kb_id: str, doc_id: str, page_number: int, content: str) -> None:
+        data = _dumps_page_content(content, self.page_content_format)
+        try:
+            await client.put_object(
+                Bucket=self.bucket_name,
+                Key=f"{kb_id}/{doc_id}/{_page_content_file_names(page_number, self.page_content_format)[0]}",
+                Body=data,
+                ContentType=_PAGE_CONTENT_TYPES[self.page_content_format]
+            )
         except Exception as e:
-            print(f"Error loading data from S3: {str(e)}")
-            return None
\ No newline at end of file
+            raise RuntimeError(f"Failed to upload page content to S3.") from e
+
+    async def aload_page_content(self, kb_id: str, doc_id: str, page_number: int) -> Optional[str]:
+        """Load the text content of a page from S3"""
+        async with self.create_async_s3_client() as client:
+            return await self._aget_page_content(client, kb_id, doc_id, page_number)
+
+    async def aload_page_content_range(self, kb_id: str, doc_id: str, page_start: int, page_end: int) -> list[str]:
+        """Load the text content for a range of pages from S3, fetching all of the pages concurrently"""
+        page_numbers = range(page_start, page_end + 1)
+        if not page_numbers:
+            return []
+
+        async with self.create_async_s3_client() as client:
+            # gather preserves the page order
+            results = await asyncio.gather(*(self._aget_page_content(client, kb_id, doc_id, i) for i in page_numbers))
+        return [content for content in results if content is not None]
+
+    async def asave_page_content(self, kb_id: str, doc_id: str, page_number: int, content: str) -> None:
+        """Save the text content of a page to S3"""
+        async with self.create_async_s3_client() as client:
+            await self._aput_page_content(client, kb_id, doc_id, page_number, content)
+
+    async def asave_page_contents_bulk(self, kb_id: str, doc_id: str, contents: dict[int, str]) -> None:
+        """Save the text content of many pages to S3, uploading all of them concurrently"""
+        if not contents:
+            return
+
+        async with self.create_async_s3_client() as client:
+            await asyncio.gather(*(
+                self._aput_page_content(client, kb_id, doc_id, page_number, content)
+                for page_number, content in contents.items()
+            ))
+
+    async def aload_data(self, kb_id: str, doc_id: str, data_name: str) -> Optional[dict]:
+        """
+        Load JSON data from a file in S3. Shares the ETag-validated cache used by load_data (if cache_data is enabled),
+        so the returned data is shared between calls and should not be modified.
+        """
+        s3_key = f"{kb_id}/{doc_id}/{data_name}.json"
+        cached = self._data_cache.get(s3_key)
+
+        async with self.create_async_s3_client() as client:
+            try:
+                if cached is not None:
+                    response = await client.get_object(Bucket=self.bucket_name, Key=s3_key, IfNoneMatch=cached[0])
+                else:
+                    response = await client.get_object(Bucket=self.bucket_name, Key=s3_key)
+                async with response['Body'] as stream:
+                    data = _loads_json(await stream.read())
+                self._data_cache.put(s3_key, response['ETag'], data)
+                return data
+            except client.exceptions.NoSuchKey:
+                logger.debug("File not found in S3: %s", s3_key)
+                return None
+            except json.JSONDecodeError as e:
+                logger.error("Error decoding JSON from S3 file %s: %s", s3_key, e)
+                return None
+            except client.exceptions.ClientError as e:
+                if cached is not None and e.response['Error']['Code'] == '304':
+                    # Not modified since it was cached
+                    return cached[1]
+                logger.error("Error loading data from S3: %s", e)
+                return None
+            except Exception as e:
+                logger.error("Error loading data from S3: %s", e)
+                return None
@@ -0,0 +1,113 @@
+import os
+import struct
+import threading
+from typing import Optional
+
+# Each record in the log is the UTF-8 byte length of the page content (little-endian u32) followed by the content itself
+_RECORD_HEADER = struct.Struct("<I")
+# Each index entry is (page_number, offset of the page content in the log, length of the page content)
+_INDEX_ENTRY = struct.Struct("<qQI")
+
+# Serializes appends so concurrent writers can't interleave records or index entries
+_APPEND_LOCK = threading.Lock()
+
+
+class LocalPageStore:
+    """
+    Stores the text content of all of a document's pages in a single append-only log file, instead of one JSON file per page.
+
+    Page records are appended to `pages.log`, and a fixed-width entry pointing at each record is appended to `pages.idx`.
+    Saving a page that already exists appends a new record, and the entry appended last wins when the index is read.
+    Both files live in the document's directory, so they are removed along with the rest of the document.
+    """
+    LOG_FILE_NAME = "pages.log"
+    INDEX_FILE_NAME = "pages.idx"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.log_path = os.path.join(directory, self.LOG_FILE_NAME)
+        self.index_path = os.path.join(directory, self.INDEX_FILE_NAME)
+
+    def append(self, contents: dict[int, str]) -> None:
+        """
+        Append the text content of one or more pages, keyed by page number
+        """
+        if not contents:
+            return
+
+        with _APPEND_LOCK:
+            with open(self.log_path, "ab") as log_file:
+                offset = log_file.tell()
+                records = bytearray()
+                entries = bytearray()
+                for page_number, content in contents.items():
+                    data = content.encode("utf-8")
+                    records += _RECORD_HEADER.pack(len(data))
+                    entries += _INDEX_ENTRY.pack(page_number, offset + len(records), len(data))
+                    records += data
+                log_file.write(records)
+
+            # The index is written after the log is closed, so an entry never points past the end of the log
+            with open(self.index_path, "ab") as index_file:
+                index_file.write(entries)
+
+    def load(self, page_number: int) -> Optional[str]:
+        """
+        Load the text content of a single page, or None if the page isn't in the store
+        """
+        entry = self._read_index().get(page_number)
+        if entry is None:
+            return None
+
+        offset, length = entry
+        with open(self.log_path, "rb") as log_file:
+            log_file.seek(offset)
+            return log_file.read(length).decode("utf-8")
+
+    def load_range(self, page_start: int, page_end: int) -> dict[int, str]:
+        """
+        Load the text content of the pages in a range (inclusive) that are in the store, keyed by page number
+        """
+        index = self._read_index()
+        entries = {i: index[i] for i in range(page_start, page_end + 1) if i in index}
+        if not entries:
+            return {}
+
+        start = min(offset for offset, _ in entries.values())
+        end = max(offset + length for offset, length in entries.values())
+        total_length = sum(length for _, length in entries.values())
+
+        with open(self.log_path, "rb") as log_file:
+            if end - start > 2 * total_length:
+                # The pages are spread out across the log (e.g. some were rewritten later), so read them individually
+                contents = {}
+                for page_number, (offset, length) in entries.items():
+                    log_file.seek(offset)
+                    contents[page_number] = log_file.read(length).decode("utf-8")
+                return contents
+
+            # Read the whole span in one go and slice the pages out of it
+            log_file.seek(start)
+            data = memoryview(log_file.read(end - start))
+
+        return {
+            page_number: str(data[offset - start:offset - start + length], "utf-8")
+            for page_number, (offset, length) in entries.items()
+        }
+
+    def _read_index(self) -> dict[int, tuple[int, int]]:
+        """
+        Read the index, mapping each page number to the (offset, length) of its latest record
+        """
+        try:
+            with open(self.index_path, "rb") as index_file:
+                data = index_file.read()
+        except FileNotFoundError:
+            return {}
+
+        # Ignore a partially written trailing entry
+        usable_length = len(data) - len(data) % _INDEX_ENTRY.size
+        return {
+            page_number: (offset, length)
+            for page_number, offset, length in _INDEX_ENTRY.iter_unpack(memoryview(data)[:usable_length])
+        }
@@ -1,9 +1,14 @@
 import PIL.Image
 import os
 import io
+from typing import Optional
 from ..utils.imports import vertexai, genai_new
 
-def make_llm_call_gemini(image_path: str, system_message: str, model: str = "gemini-2.0-flash", response_schema: dict = None, max_tokens: int = 4000, temperature: float = 0.5) -> str:
+def make_llm_call_gemini(image_path: Optional[str], system_message: str, model: str = "gemini-2.0-flash", response_schema: dict = None, max_tokens: int = 4000, temperature: float = 0.5, image_bytes: Optional[bytes] = None) -> str:
+    """
+    This function calls the Gemini API with an image and a system message and returns the response text.
+    The image can either be given as a file path or, to avoid a round trip to disk, as the raw image bytes.
+    """
     # With the newer Google GenAI SDK, we need to create a client
     client = genai_new.Client(api_key=os.environ["GEMINI_API_KEY"])
 
@@ -20,7 +25,7 @@ def make_llm_call_gemini(image_path: str, system_message: str, model: str = "gem
 
     try:
         # Open and compress the image
-        image = PIL.Image.open(image_path)
+        image = PIL.Image.open(io.BytesIO(image_bytes) if image_bytes is not None else image_path)
         compressed_image_bytes, _ = compress_image(image) # Quality is returned but not used here
 
         # Close the original image object now that compression is done
@@ -70,9 +75,10 @@ def make_llm_call_gemini(image_path: str, system_message: str, model: str = "gem
             except Exception:
                 pass # Ignore errors if it fails (e.g., trying to close a None object or already closed and problematic)
 
-def make_llm_call_vertex(image_path: str, system_message: str, model: str, project_id: str, location: str, response_schema: dict = None, max_tokens: int = 4000, temperature: float = 0.5) -> str:
+def make_llm_call_vertex(image_path: Optional[str], system_message: str, model: str, project_id: str, location: str, response_schema: dict = None, max_tokens: int = 4000, temperature: float = 0.5, image_bytes: Optional[bytes] = None) -> str:
     """
     This function calls the Vertex AI Gemini API (not to be confused with the Gemini API) with an image and a system message and returns the response text.
+    The image can either be given as a file path or, to avoid a round trip to disk, as the raw image bytes.
     """
     vertexai.init(project=project_id, location=location)
     model = vertexai.generative_models.GenerativeModel(model)
@@ -82,9 +88,14 @@ def make_llm_call_vertex(image_path: str, system_message: str, model: str, proje
     else:
         generation_config = vertexai.generative_models.GenerationConfig(temperature=temperature, max_output_tokens=max_tokens)
     
+    if image_bytes is not None:
+        image = vertexai.generative_models.Image.from_bytes(image_bytes)
+    else:
+        image = vertexai.generative_models.Image.load_from_file(image_path)
+
     response = model.generate_content(
         [
-            vertexai.generative_models.Part.from_image(vertexai.generative_models.Image.load_from_file(image_path)),
+            vertexai.generative_models.Part.from_image(image),
             system_message,
         ],
         generation_config=generation_config,
@@ -10,6 +10,7 @@ from .element_types import (
     get_num_non_visual_elements,
 )
 from pdf2image import convert_from_path
+import os
 import json
 import time
 import logging
@@ -92,7 +93,7 @@ def pdf_to_images(pdf_path: str, kb_id: str, doc_id: str, file_system: FileSyste
     - pdf_path: str - the path to the PDF file.
     - page_images_path: str - the path to the folder where the images will be saved.
     - thread_count: int - the number of threads to use for converting the PDF to images.
-    - max_workers: int - the number of workers to use for saving the images.
+    - max_workers: int - the number of threads poppler uses to convert the PDF to images.
 
     Returns:
     - image_file_paths: list[str] - a list of the paths to the saved images.
@@ -108,11 +109,6 @@ def pdf_to_images(pdf_path: str, kb_id: str, doc_id: str, file_system: FileSyste
     # Create the folder
     file_system.create_directory(kb_id, doc_id)
 
-    def save_single_image(args):
-        i, image = args
-        file_system.save_image(kb_id, doc_id, f'page_{i+1}.jpg', image)
-        return f'/{kb_id}/{doc_id}/page_{i+1}.jpg'
-
     # Convert PDF to images in batches of max_pages
     page_count = get_page_count(pdf_path, kb_id, doc_id)
     all_image_paths = []
@@ -124,12 +120,15 @@ def pdf_to_images(pdf_path: str, kb_id: str, doc_id: str, file_system: FileSyste
                                  first_page=i, last_page=last_page)
         
         # Save batch of images in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            batch_paths = list(executor.map(save_single_image, enumerate(images, start=i-1)))
-            all_image_paths.extend(batch_paths)
+        file_names = [f'page_{j+1}.jpg' for j in range(i-1, i-1 + len(images))]
+        file_system.save_images_bulk(kb_id, doc_id, list(zip(file_names, images)))
+        all_image_paths.extend(f'/{kb_id}/{doc_id}/{file_name}' for file_name in file_names)
         
         logger.debug(f"Converted pages {i} to {last_page}", extra=base_extra)
 
+    # Record the complete set of page images now that they've all been saved
+    file_system.save_page_image_manifest(kb_id, doc_id, [os.path.basename(path) for path in all_image_paths])
+
     logger.info(f"Converted total {len(all_image_paths)} pages to images", extra=base_extra)
     return all_image_paths
 
@@ -138,7 +137,7 @@ def parse_page(kb_id: str, doc_id: str, file_system: FileSystem, page_number: in
     Given an image of a page, use LLM to extract the content of the page.
 
     Inputs:
-    - page_image_path: str, path to the image of the page
+    - page_number: int, the page to parse; its image is loaded from the file system
     - vlm_config: dict, configuration for the VLM
     - element_types: list[ElementType], list of element types that the VLM can output
     
@@ -164,7 +163,8 @@ def parse_page(kb_id: str, doc_id: str, file_system: FileSystem, page_number: in
         element_description_block=get_element_description_block(element_types)
     )
 
-    page_image_path = file_system.get_files(kb_id, doc_id, page_number, page_number)[0]
+    # Read the page image straight into memory rather than downloading it to a local file first
+    page_image_bytes = file_system.get_files_bytes(kb_id, doc_id, page_number, page_number)[page_number]
 
     if vlm_config["provider"] == "vertex_ai":
         try:
@@ -174,7 +174,8 @@ def parse_page(kb_id: str, doc_id: str, file_system: FileSystem, page_number: in
             temperature = vlm_config.get("temperature", 0.5) 
 
             llm_output = make_llm_call_vertex(
-                image_path=page_image_path, 
+                image_path=None,
+                image_bytes=page_image_bytes,
                 system_message=system_message, 
                 model=vlm_config["model"], 
                 project_id=vlm_config["project_id"], 
@@ -200,7 +201,8 @@ def parse_page(kb_id: str, doc_id: str, file_system: FileSystem, page_number: in
             temperature = vlm_config.get("temperature", 0.5) 
             
             llm_output = make_llm_call_gemini(
-                image_path=page_image_path, 
+                image_path=None,
+                image_bytes=page_image_bytes,
                 system_message=system_message, 
                 model=vlm_config["model"],
                 response_schema=response_schema,
@@ -226,7 +228,7 @@ def parse_page(kb_id: str, doc_id: str, file_system: FileSystem, page_number: in
         page_content = json.loads(llm_output)
     except Exception as e:
         base_extra = {"kb_id": kb_id, "doc_id": doc_id, "page_number": page_number}
-        logger.error(f"Error parsing JSON for {page_image_path}: {e}", extra=base_extra)
+        logger.error(f"Error parsing JSON for page {page_number}: {e}", extra=base_extra)
         
         # Log the full model output for debugging purposes
         logger.debug("Full problematic model output:", extra={
@@ -1,11 +1,16 @@
 import os
 import sys
+import json
+import math
+import asyncio
 import unittest
+from unittest.mock import patch
 from pdf2image import convert_from_path
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-from dsparse.file_parsing.file_system import LocalFileSystem, S3FileSystem
+from dsparse.utils.imports import LazyLoader
+from dsparse.file_parsing.file_system import LocalFileSystem, S3FileSystem, AsyncS3FileSystem, UringFileSystem, is_io_uring_available
 
 
 class TestLocalFileSystem(unittest.TestCase):
@@ -34,6 +39,32 @@ class TestLocalFileSystem(unittest.TestCase):
         # Make sure the file was saved
         self.assertTrue(os.path.exists(os.path.join(self.base_path, self.kb_id, self.doc_id, file_name)))
 
+    def test__002_save_json_load_data(self):
+
+        data = self.file_system.load_data(self.kb_id, self.doc_id, "elements")
+        self.assertEqual(data, {"test_key": "test_value", "test_key_2": "test_value_2"})
+        # Caching is off by default
+        self.assertIsNot(self.file_system.load_data(self.kb_id, self.doc_id, "elements"), data)
+
+        file_system = LocalFileSystem(base_path=self.base_path, cache_data=True)
+        data = file_system.load_data(self.kb_id, self.doc_id, "elements")
+        # Loading it again should return the cached data
+        self.assertIs(file_system.load_data(self.kb_id, self.doc_id, "elements"), data)
+
+        # Saving the file again should invalidate the cache
+        file_system.save_json(self.kb_id, self.doc_id, "elements.json", {"test_key": "new_value"})
+        self.assertEqual(file_system.load_data(self.kb_id, self.doc_id, "elements"), {"test_key": "new_value"})
+        self.assertIsNone(file_system.load_data(self.kb_id, self.doc_id, "missing"))
+
+        # Data the json module accepts is saved and loaded the same way whether or not orjson is installed
+        self.file_system.save_json(self.kb_id, self.doc_id, "json_edge_cases.json", {1: "a", "big": 2**70 + 1, "nan": float("nan")})
+        data = self.file_system.load_data(self.kb_id, self.doc_id, "json_edge_cases")
+        self.assertEqual(data["1"], "a")
+        self.assertIsInstance(data["big"], int)
+        self.assertEqual(data["big"], 2**70 + 1)
+        self.assertIsInstance(data["nan"], float)
+        self.assertTrue(math.isnan(data["nan"]))
+
     def test__003_save_image(self):
 
         pdf_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../tests/data/mck_energy_first_5_pages.pdf'))
@@ -47,6 +78,19 @@ class TestLocalFileSystem(unittest.TestCase):
         file_name = "page_1.jpg"
         self.file_system.save_image(self.kb_id, self.doc_id, file_name, images[1])
 
+    def test__003_save_images_bulk(self):
+
+        pdf_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../tests/data/mck_energy_first_5_pages.pdf'))
+        images = convert_from_path(pdf_path, dpi=150)
+
+        # Use a separate document so the other tests only see the two pages saved above
+        doc_id = "test_doc_bulk"
+        self.file_system.create_directory(self.kb_id, doc_id)
+        self.file_system.save_images_bulk(self.kb_id, doc_id, [(f"page_{i}.jpg", image) for i, image in enumerate(images)])
+        files = self.file_system.get_all_jpg_files(self.kb_id, doc_id)
+        self.assertEqual(files, [os.path.join(self.base_path, self.kb_id, doc_id, f"page_{i}.jpg") for i in range(len(images))])
+        self.file_system.delete_directory(self.kb_id, doc_id)
+
     def test__004_get_files(self):
 
         files = self.file_system.get_files(self.kb_id, self.doc_id, page_start=0, page_end=1)
@@ -56,6 +100,17 @@ class TestLocalFileSystem(unittest.TestCase):
         files = self.file_system.get_files(self.kb_id, self.doc_id, page_start=2, page_end=2)
         self.assertTrue(len(files) == 0)
 
+    def test__004_get_files_bytes(self):
+
+        page_images = self.file_system.get_files_bytes(self.kb_id, self.doc_id, page_start=0, page_end=2)
+        self.assertEqual(sorted(page_images.keys()), [0, 1])
+        with open(os.path.join(self.base_path, self.kb_id, self.doc_id, "page_0.jpg"), "rb") as f:
+            self.assertEqual(page_images[0], f.read())
+
+        # A single page is read directly
+        self.assertEqual(self.file_system.get_files_bytes(self.kb_id, self.doc_id, page_start=1, page_end=1).keys(), {1})
+        self.assertEqual(self.file_system.get_files_bytes(self.kb_id, self.doc_id, page_start=2, page_end=2), {})
+
     def test__005_get_all_files(self):
             
         files = self.file_system.get_all_jpg_files(self.kb_id, self.doc_id)
@@ -64,6 +119,35 @@ class TestLocalFileSystem(unittest.TestCase):
         self.assertTrue(files[0] == os.path.join(self.base_path, self.kb_id, self.doc_id, "page_0.jpg"))
         self.assertTrue(files[1] == os.path.join(self.base_path, self.kb_id, self.doc_id, "page_1.jpg"))
 
+    def test__005_page_content_formats(self):
+
+        # JSON by default, MessagePack if configured
+        self.file_system.save_page_content(self.kb_id, self.doc_id, 0, "Page zero \"quoted\"")
+        msgpack_file_system = LocalFileSystem(base_path=self.base_path, page_content_format="msgpack")
+        msgpack_file_system.save_page_content(self.kb_id, self.doc_id, 1, "Page one")
+        doc_path = os.path.join(self.base_path, self.kb_id, self.doc_id)
+        self.assertTrue(os.path.exists(os.path.join(doc_path, "page_content_0.json")))
+        self.assertTrue(os.path.exists(os.path.join(doc_path, "page_content_1.msgpack")))
+
+        # MessagePack file systems also load JSON pages; JSON file systems only look for JSON pages
+        self.assertEqual(msgpack_file_system.load_page_content(self.kb_id, self.doc_id, 0), "Page zero \"quoted\"")
+        self.assertEqual(
+            msgpack_file_system.load_page_content_range(self.kb_id, self.doc_id, 0, 2),
+            ["Page zero \"quoted\"", "Page one"]
+        )
+        self.assertIsNone(self.file_system.load_page_content(self.kb_id, self.doc_id, 1))
+        self.assertEqual(self.file_system.load_page_content_range(self.kb_id, self.doc_id, 0, 2), ["Page zero \"quoted\""])
+
+        # MessagePack pages can't be loaded without msgpack, which is an error rather than a missing page
+        with patch("dsparse.file_parsing.file_system.msgpack", LazyLoader("msgpack_not_installed", "msgpack")):
+            with self.assertRaises(ImportError):
+                msgpack_file_system.load_page_content(self.kb_id, self.doc_id, 1)
+            with self.assertRaises(ImportError):
+                msgpack_file_system.load_page_content_range(self.kb_id, self.doc_id, 0, 2)
+
+        with self.assertRaises(ValueError):
+            LocalFileSystem(base_path=self.base_path, page_content_format="cbor")
+
     def test__006_delete_directory(self):
 
         self.file_system.delete_directory(self.kb_id, self.doc_id)
@@ -93,6 +177,41 @@ class TestLocalFileSystem(unittest.TestCase):
             pass
 
 
+@unittest.skipUnless(is_io_uring_available(), "io_uring is not available")
+class TestUringFileSystem(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.kb_id = "test_kb"
+        self.doc_id = "test_doc"
+        self.base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data/dsparse_uring_file_system_test'))
+        self.file_system = UringFileSystem(base_path=self.base_path)
+        self.file_system.create_directory(self.kb_id, self.doc_id)
+
+    def test__001_load_page_content_range(self):
+        page_contents = {i: f"Content of page {i}" for i in range(1, 301)}
+        # Larger than the io_uring read buffer, so it has to be read in more than one go
+        page_contents[150] = "Long page " * 10000
+        self.file_system.save_page_contents_bulk(self.kb_id, self.doc_id, page_contents)
+
+        loaded = self.file_system.load_page_content_range(self.kb_id, self.doc_id, 0, 301)
+        self.assertEqual(loaded, [page_contents[i] for i in range(1, 301)])
+
+    def test__002_load_mixed_page_content_formats(self):
+        # Pages saved as JSON are read in a second batch, after the MessagePack pages
+        msgpack_file_system = UringFileSystem(base_path=self.base_path, page_content_format="msgpack")
+        msgpack_file_system.save_page_content(self.kb_id, self.doc_id, 301, "MessagePack page")
+        loaded = msgpack_file_system.load_page_content_range(self.kb_id, self.doc_id, 299, 302)
+        self.assertEqual(loaded, ["Content of page 299", "Content of page 300", "MessagePack page"])
+
+    @classmethod
+    def tearDownClass(self):
+        try:
+            os.system(f"rm -rf {self.base_path}")
+        except:
+            pass
+
+
 class TestS3FileSystem(unittest.TestCase):
 
     @classmethod
@@ -155,6 +274,55 @@ class TestS3FileSystem(unittest.TestCase):
         self.assertTrue(files[0] == os.path.join(self.base_path, self.kb_id, self.doc_id, "page_0.jpg"))
         self.assertTrue(files[1] == os.path.join(self.base_path, self.kb_id, self.doc_id, "page_1.jpg"))
 
+    def test__005_page_image_manifest(self):
+
+        pdf_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../tests/data/mck_energy_first_5_pages.pdf'))
+        images = convert_from_path(pdf_path, dpi=150)
+
+        # Use a separate document so the other tests only see the two pages saved above
+        doc_id = "test_doc_manifest"
+        file_names = ["page_1.jpg", "page_2.jpg"]
+        self.s3_file_system.save_images_bulk(self.kb_id, doc_id, list(zip(file_names, images)))
+        self.s3_file_system.save_page_image_manifest(self.kb_id, doc_id, file_names)
+
+        # With a manifest, the page images are found without listing the document's prefix
+        with patch.object(self.s3_file_system, "_list_keys", side_effect=AssertionError("listed the prefix")):
+            self.assertEqual(len(self.s3_file_system.get_files(self.kb_id, doc_id, page_start=1, page_end=2)), 2)
+            self.assertEqual(self.s3_file_system.get_files_bytes(self.kb_id, doc_id, page_start=1, page_end=2).keys(), {1, 2})
+            self.assertEqual(
+                self.s3_file_system.get_all_jpg_files(self.kb_id, doc_id),
+                [os.path.join(self.base_path, self.kb_id, doc_id, file_name) for file_name in file_names]
+            )
+
+        # A corrupt manifest is an error rather than a reason to list the prefix
+        self.s3_file_system.create_s3_client().put_object(
+            Bucket=self.s3_file_system.bucket_name, Key=f"{self.kb_id}/{doc_id}/manifest.json", Body=b"[{"
+        )
+        with patch.object(self.s3_file_system, "_list_keys", side_effect=AssertionError("listed the prefix")):
+            with self.assertRaises(RuntimeError):
+                self.s3_file_system._list_page_image_keys(self.kb_id, doc_id)
+            # ... which is logged, with no files returned
+            self.assertEqual(self.s3_file_system.get_files(self.kb_id, doc_id, page_start=1, page_end=2), [])
+            self.assertEqual(self.s3_file_system.get_files_bytes(self.kb_id, doc_id, page_start=1, page_end=2), {})
+
+        self.s3_file_system.delete_directory(self.kb_id, doc_id)
+
+    def test__005_s3_errors(self):
+
+        # S3 errors (here, a bucket that doesn't exist or isn't ours) are logged, and no files are returned,
+        # so callers can fall back (e.g. KnowledgeBase falls back to text when there are no page images)
+        file_system = S3FileSystem(
+            base_path=self.base_path,
+            bucket_name=f"{self.s3_file_system.bucket_name}-missing-dsrag-test",
+            region_name=self.s3_file_system.region_name,
+            access_key=self.s3_file_system.access_key,
+            secret_key=self.s3_file_system.secret_key
+        )
+        self.assertEqual(file_system.get_files(self.kb_id, self.doc_id, page_start=0, page_end=1), [])
+        self.assertEqual(file_system.get_files_bytes(self.kb_id, self.doc_id, page_start=0, page_end=1), {})
+        self.assertEqual(file_system.get_files_bytes(self.kb_id, self.doc_id, page_start=0, page_end=0), {})
+        self.assertEqual(file_system.get_all_jpg_files(self.kb_id, self.doc_id), [])
+
     def test__006_delete_directory(self):
 
         objects_deleted = self.s3_file_system.delete_directory(self.kb_id, self.doc_id)
@@ -189,5 +357,46 @@ class TestS3FileSystem(unittest.TestCase):
             pass
 
 
+
+class TestAsyncS3FileSystem(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.kb_id = "test_kb_async"
+        self.doc_id = "test_doc"
+        self.base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data/dsparse_async_file_system_test'))
+        self.s3_file_system = AsyncS3FileSystem(
+            base_path=self.base_path,
+            bucket_name=os.environ["AWS_S3_BUCKET_NAME"],
+            region_name=os.environ["AWS_S3_REGION"],
+            access_key=os.environ["AWS_S3_ACCESS_KEY"],
+            secret_key=os.environ["AWS_S3_SECRET_KEY"]
+        )
+
+    def test__001_save_page_contents_bulk(self):
+        contents = {i: f"Page {i} content" for i in range(5)}
+        self.s3_file_system.save_page_contents_bulk(self.kb_id, self.doc_id, contents)
+
+    def test__002_load_page_content_range(self):
+        page_contents = self.s3_file_system.load_page_content_range(self.kb_id, self.doc_id, 0, 9)
+        self.assertEqual(page_contents, [f"Page {i} content" for i in range(5)])
+
+    def test__003_aload_page_content(self):
+        self.assertEqual(asyncio.run(self.s3_file_system.aload_page_content(self.kb_id, self.doc_id, 2)), "Page 2 content")
+        self.assertIsNone(asyncio.run(self.s3_file_system.aload_page_content(self.kb_id, self.doc_id, 5)))
+
+    def test__004_to_dict(self):
+        file_system = AsyncS3FileSystem.from_dict(self.s3_file_system.to_dict())
+        self.assertIsInstance(file_system, AsyncS3FileSystem)
+
+    @classmethod
+    def tearDownClass(self):
+        try:
+            self.s3_file_system.delete_kb(self.kb_id)
+            os.system(f"rm -rf {self.base_path}")
+        except:
+            pass
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
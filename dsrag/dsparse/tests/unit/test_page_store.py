@@ -0,0 +1,75 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from dsparse.file_parsing.page_store import LocalPageStore
+from dsparse.file_parsing.file_system import LocalFileSystem
+
+
+class TestLocalPageStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.kb_id = "test_kb"
+        self.doc_id = "test_doc"
+        self.base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data/dsparse_page_store_test'))
+        self.file_system = LocalFileSystem(base_path=self.base_path, use_page_store=True)
+        self.file_system.create_directory(self.kb_id, self.doc_id)
+        self.page_store = LocalPageStore(os.path.join(self.base_path, self.kb_id, self.doc_id))
+
+    def test__001_append_and_load(self):
+        self.page_store.append({1: "Page one", 2: "Page two with unicode: é ✓", 3: ""})
+        self.assertEqual(self.page_store.load(1), "Page one")
+        self.assertEqual(self.page_store.load(2), "Page two with unicode: é ✓")
+        self.assertEqual(self.page_store.load(3), "")
+        self.assertIsNone(self.page_store.load(4))
+
+    def test__002_load_range(self):
+        contents = self.page_store.load_range(0, 10)
+        self.assertEqual(contents, {1: "Page one", 2: "Page two with unicode: é ✓", 3: ""})
+
+    def test__003_rewrite_page(self):
+        # The most recently appended record for a page wins
+        self.page_store.append({2: "Page two, rewritten"})
+        self.assertEqual(self.page_store.load(2), "Page two, rewritten")
+        self.assertEqual(self.page_store.load_range(1, 2), {1: "Page one", 2: "Page two, rewritten"})
+
+    def test__004_file_system_page_content(self):
+        self.file_system.save_page_contents_bulk(self.kb_id, self.doc_id, {10: "Page ten", 11: "Page eleven"})
+        self.file_system.save_page_content(self.kb_id, self.doc_id, 12, "Page twelve")
+        self.assertEqual(self.file_system.load_page_content(self.kb_id, self.doc_id, 11), "Page eleven")
+        self.assertEqual(
+            self.file_system.load_page_content_range(self.kb_id, self.doc_id, 10, 13),
+            ["Page ten", "Page eleven", "Page twelve"]
+        )
+        # No per-page JSON files should have been written
+        doc_path = os.path.join(self.base_path, self.kb_id, self.doc_id)
+        self.assertFalse(any(file.startswith("page_content_") for file in os.listdir(doc_path)))
+
+    def test__005_legacy_json_pages(self):
+        # Pages saved as individual JSON files are still loaded when the page store is enabled
+        LocalFileSystem(base_path=self.base_path).save_page_content(self.kb_id, self.doc_id, 13, "Page thirteen")
+        self.assertEqual(self.file_system.load_page_content(self.kb_id, self.doc_id, 13), "Page thirteen")
+        self.assertEqual(
+            self.file_system.load_page_content_range(self.kb_id, self.doc_id, 12, 13),
+            ["Page twelve", "Page thirteen"]
+        )
+
+    def test__006_to_dict(self):
+        config = self.file_system.to_dict()
+        self.assertTrue(config["use_page_store"])
+        file_system = LocalFileSystem.from_dict(config)
+        self.assertTrue(file_system.use_page_store)
+
+    @classmethod
+    def tearDownClass(self):
+        try:
+            os.system(f"rm -rf {self.base_path}")
+        except:
+            pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -67,4 +67,8 @@ anthropic = LazyLoader("anthropic")
 genai = LazyLoader("google.generativeai", "google-generativeai")
 genai_new = LazyLoader("google.genai", "google-genai")
 vertexai = LazyLoader("vertexai") 
-boto3 = LazyLoader("boto3")
\ No newline at end of file
+boto3 = LazyLoader("boto3")
+botocore = LazyLoader("botocore", "boto3")
+liburing = LazyLoader("liburing")
+aiobotocore = LazyLoader("aiobotocore")
+msgpack = LazyLoader("msgpack")
@@ -46,7 +46,7 @@ class TestRetrieval(unittest.TestCase):
         print(f"Found {len(jpg_files)} JPG files")
 
         # Check for page content files
-        page_content_files = [f for f in os.listdir(doc_dir) if f.startswith('page_content_') and f.endswith('.json')]
+        page_content_files = [f for f in os.listdir(doc_dir) if f.startswith('page_content_')]
         self.assertTrue(len(page_content_files) > 0, "No page content files were created during VLM parsing")
         print(f"Found {len(page_content_files)} page content files")
 
@@ -208,7 +208,7 @@ class TestRetrieval(unittest.TestCase):
         self.assertTrue(os.path.exists(doc_dir))
         
         # Check that page content files were created
-        page_content_files = [f for f in os.listdir(doc_dir) if f.startswith('page_content_') and f.endswith('.json')]
+        page_content_files = [f for f in os.listdir(doc_dir) if f.startswith('page_content_')]
         self.assertTrue(len(page_content_files) > 0)
         
         # Test loading content for a specific page
@@ -233,13 +233,19 @@ class TestRetrieval(unittest.TestCase):
             self.assertTrue(isinstance(content, str))
             self.assertTrue(len(content) > 0)
 
-        # Verify the content format
-        import json
-        page_content_path = os.path.join(doc_dir, 'page_content_1.json')
-        with open(page_content_path, 'r') as f:
-            content_data = json.load(f)
-            self.assertIn('content', content_data)
-            self.assertTrue(isinstance(content_data['content'], str))
+        # Verify the content format (MessagePack if page_content_format="msgpack", JSON by default)
+        page_content_path = os.path.join(doc_dir, 'page_content_1.msgpack')
+        if os.path.exists(page_content_path):
+            import msgpack
+            with open(page_content_path, 'rb') as f:
+                self.assertTrue(isinstance(msgpack.unpackb(f.read(), raw=False), str))
+        else:
+            import json
+            page_content_path = os.path.join(doc_dir, 'page_content_1.json')
+            with open(page_content_path, 'r') as f:
+                content_data = json.load(f)
+                self.assertIn('content', content_data)
+                self.assertTrue(isinstance(content_data['content'], str))
 
         # Test that non-VLM document doesn't create page content
         kb.add_document(